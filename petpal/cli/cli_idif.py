@@ -53,7 +53,8 @@ def main():
     # Double threshold sub-command
     double_parser = subparsers.add_parser("double", help="Use double threshold method")
     double_parser.add_argument("--necktangle-filepath", type=str, required=True,
-                               help="Path to the 4D PET necktangle matrix file.")
+                               help="Path to the 4D PET necktangle matrix file (frame-major, "
+                                    "shape (t, x, y, z)).")
     double_parser.add_argument("--percentile", type=float, required=True, help="Percentile for manual threshold value.")
     double_parser.add_argument("--frame-start-times-filepath", type=str, required=True,
                                help="Path to the frame start times file.")
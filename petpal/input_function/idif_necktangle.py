@@ -4,10 +4,11 @@ This module contains a collection of functions to calculate an image-derived inp
 This method was developed and provided for use in this software package by `Dr. Karl Friedrichsen <https://orcid.org/0000-0002-9233-1418>`_
 
 Requires:
-    The module relies on the :doc:`numpy <numpy:index>` module.
+    The module relies on the :doc:`numpy <numpy:index>` and :doc:`numba <numba:index>` modules.
 
 """
 
+import numba
 import numpy as np
 
 
@@ -40,14 +41,60 @@ def single_threshold_idif_from_4d_pet_with_necktangle(pet_4d_data: np.ndarray,
     threshold_value = np.nanpercentile(carotid_masked_bolus_mean_3d, percentile)
     bolus_mean_threshold_masked_3d = np.where(carotid_masked_bolus_mean_3d > threshold_value,
                                               carotid_masked_bolus_mean_3d, np.nan)
-    bolus_mean_threshold_binary_mask_3d = np.where(bolus_mean_threshold_masked_3d >= 1000, 1, 0)
+    bolus_mean_threshold_binary_mask_3d = bolus_mean_threshold_masked_3d >= 1000
 
-    pet_data_4d_masked = np.zeros(pet_4d_data.shape)
-    for frame in range(pet_data_4d_masked.shape[3]):
-        pet_data_4d_masked[:, :, :, frame] = np.where(bolus_mean_threshold_binary_mask_3d == 1,
-                                                      pet_4d_data[:, :, :, frame], np.nan)
+    tac = average_masked_4d_pet_into_tac(pet_4d_data=pet_4d_data,
+                                         threshold_binary_mask_3d=bolus_mean_threshold_binary_mask_3d)
+
+    return tac
+
+
+def apply_threshold_binary_mask_to_4d_pet(pet_4d_data: np.ndarray,
+                                          threshold_binary_mask_3d: np.ndarray,
+                                          inplace: bool = False) -> np.ndarray:
+    """
+    Applies a 3D binary mask to every frame of a 4D PET image, zeroing voxels outside the mask.
+
+    The mask is broadcast over the time axis in a single multiply, so no frame-by-frame
+    temporaries are created. With ``inplace=True`` the multiply writes directly into
+    ``pet_4d_data``, avoiding the allocation of a second full-size 4D array.
+
+    Args:
+        pet_4d_data (np.ndarray): 4-dimensional array representing the PET data.
+        threshold_binary_mask_3d (np.ndarray): 3-dimensional binary mask where voxels to keep are 1.
+        inplace (bool, optional): If True, masks ``pet_4d_data`` in place and returns it. Defaults to False.
+
+    Returns:
+        masked_pet_4d_data (np.ndarray): The masked 4D PET data.
+    """
+    if pet_4d_data.shape[:3] != threshold_binary_mask_3d.shape:
+        raise ValueError("pet_4d_data and threshold_binary_mask_3d must have the same spatial shape.")
+
+    out = pet_4d_data if inplace else None
+    return np.multiply(pet_4d_data, threshold_binary_mask_3d[:, :, :, np.newaxis], out=out)
 
-    tac = np.nanmean(pet_data_4d_masked, axis=(0, 1, 2))
+
+def average_masked_4d_pet_into_tac(pet_4d_data: np.ndarray,
+                                   threshold_binary_mask_3d: np.ndarray) -> np.ndarray:
+    """
+    Averages the voxels of a 4D PET image inside a 3D binary mask into a time-activity curve (TAC).
+
+    Only the voxels selected by the mask are gathered and reduced, so the average divides by the
+    number of mask voxels rather than the full spatial volume, and none of the zero voxels outside
+    the mask are touched.
+
+    Args:
+        pet_4d_data (np.ndarray): 4-dimensional array representing the PET data.
+        threshold_binary_mask_3d (np.ndarray): 3-dimensional binary mask where voxels to average are 1.
+
+    Returns:
+        tac (np.ndarray): The mean activity of the mask voxels for each frame.
+    """
+    if pet_4d_data.shape[:3] != threshold_binary_mask_3d.shape:
+        raise ValueError("pet_4d_data and threshold_binary_mask_3d must have the same spatial shape.")
+
+    masked_voxel_tacs = pet_4d_data[threshold_binary_mask_3d != 0]
+    tac = np.mean(masked_voxel_tacs, axis=0)
 
     return tac
 
@@ -69,7 +116,14 @@ def average_across_4d_frames(pet_4d_data: np.ndarray,
     if start_frame < 0 or end_frame >= pet_4d_data.shape[3]:
         raise ValueError("Frame indices are out of bounds.")
 
-    mean_frame = np.nanmean(pet_4d_data[:, :, :, start_frame:end_frame + 1], axis=3)
+    if np.issubdtype(pet_4d_data.dtype, np.floating):
+        accumulator_dtype = pet_4d_data.dtype
+    else:
+        accumulator_dtype = np.float32
+    mean_frame = pet_4d_data[:, :, :, start_frame].astype(accumulator_dtype)
+    for frame in range(start_frame + 1, end_frame + 1):
+        mean_frame += pet_4d_data[:, :, :, frame]
+    mean_frame *= 1.0 / (end_frame - start_frame + 1)
 
     return mean_frame
 
@@ -97,33 +151,125 @@ def load_fslmeants_to_numpy_3d(fslmeants_filepath: str) -> np.ndarray:
     """
     Loads `fslmeants <https://fsl.fmrib.ox.ac.uk/fsl/fslwiki/PPIHowToRun?highlight=%28fslmeants%29>`_ (--show-all) data from a file and converts it into a 3D numpy array.
 
+    The array is laid out frame-major, i.e. with shape ``(t, x, y, z)``, so that every frame is a
+    contiguous 3D slab. All the downstream necktangle reductions (frame averages, bolus window
+    mean, per-frame percentile) reduce over the spatial axes for each frame, so this layout keeps
+    their memory accesses contiguous.
+
     Args:
         fslmeants_filepath (str): The filepath of the fslmeants data file.
 
     Returns:
-        numpy_3d_array (np.ndarray): A 3D numpy array representing the fslmeants data.
+        numpy_3d_array (np.ndarray): A 4D frame-major numpy array representing the fslmeants data.
 
     Raises:
         None.
     """
-    data = np.loadtxt(fslmeants_filepath)
-    x_coord_min = min(data[0].astype(int))
-    y_coord_min = min(data[1].astype(int))
-    z_coord_min = min(data[2].astype(int))
-    x_dim = (max(data[0].astype(int)) - x_coord_min) + 1
-    y_dim = (max(data[1].astype(int)) - y_coord_min) + 1
-    z_dim = (max(data[2].astype(int)) - z_coord_min) + 1
+    data = np.loadtxt(fslmeants_filepath, dtype=np.float32)
+    x_coords = data[0].astype(np.intp)
+    y_coords = data[1].astype(np.intp)
+    z_coords = data[2].astype(np.intp)
+    x_coords -= x_coords.min()
+    y_coords -= y_coords.min()
+    z_coords -= z_coords.min()
+    x_dim = x_coords.max() + 1
+    y_dim = y_coords.max() + 1
+    z_dim = z_coords.max() + 1
     t_dim = data.shape[0] - 3
-    numpy_3d_array = np.zeros((x_dim, y_dim, z_dim, t_dim), dtype=float)
-    for location in range(data.shape[1]):
-        x_coord = data[0, location].astype(int) - x_coord_min
-        y_coord = data[1, location].astype(int) - y_coord_min
-        z_coord = data[2, location].astype(int) - z_coord_min
-        numpy_3d_array[x_coord, y_coord, z_coord, :] = data[3:, location]
+    numpy_3d_array = np.zeros((t_dim, x_dim, y_dim, z_dim), dtype=np.float32)
+    numpy_3d_array[:, x_coords, y_coords, z_coords] = data[3:, :]
 
     return numpy_3d_array
 
 
+def find_bolus_window_average(necktangle_matrix: np.ndarray) -> tuple:
+    """
+    Finds the bolus frame within the first 10 frames and averages the 3-frame window around it.
+
+    The per-frame averages are computed with one reduction over the spatial axes, and the 3-frame
+    window mean is accumulated in place, frame by frame, rather than NaN-patching a copy of the
+    window slice. The whole operation touches each bolus-window voxel once.
+
+    Args:
+        necktangle_matrix (np.ndarray): A 4D frame-major numpy array (shape ``(t, x, y, z)``)
+            representing the PET necktangle matrix.
+
+    Returns:
+        tuple: ``(bolus_index, bolus_window_average_3d)`` where ``bolus_index`` is the index of
+        the highest-mean frame among the first 10 frames and ``bolus_window_average_3d`` is the
+        mean of the frames ``bolus_index - 1`` through ``bolus_index + 1``, with the window
+        clamped to the array bounds (a bolus on the first or last frame averages the partial
+        window).
+    """
+    frame_averages = np.nanmean(necktangle_matrix[:10], axis=(1, 2, 3))
+    bolus_index = np.argmax(frame_averages)
+    window_start = max(bolus_index - 1, 0)
+    window_stop = min(bolus_index + 1, necktangle_matrix.shape[0] - 1)
+    if np.issubdtype(necktangle_matrix.dtype, np.floating):
+        accumulator_dtype = necktangle_matrix.dtype
+    else:
+        accumulator_dtype = np.float32
+    bolus_window_average_3d = necktangle_matrix[window_start].astype(accumulator_dtype)
+    for frame in range(window_start + 1, window_stop + 1):
+        bolus_window_average_3d += necktangle_matrix[frame]
+    bolus_window_average_3d *= 1.0 / (window_stop - window_start + 1)
+
+    return bolus_index, bolus_window_average_3d
+
+
+def percentile_across_voxels_with_partition(voxel_tacs: np.ndarray,
+                                            percentile: float) -> np.ndarray:
+    """
+    Computes the given percentile across voxels for each frame using a partial sort.
+
+    A full percentile call sorts every frame's voxel values, which is O(V log V) per frame.
+    Since only a single percentile is needed, this helper uses :func:`np.partition` (introselect,
+    expected O(V)) to place just the two order statistics that the linearly-interpolated
+    percentile depends on, and interpolates between them. The frames are independent, so they are
+    processed in parallel with :func:`numba.prange`; with the frame-major layout each thread reads
+    one contiguous row. The result matches ``np.percentile(voxel_tacs, percentile, axis=1)``.
+
+    Args:
+        voxel_tacs (np.ndarray): A 2D array of voxel TACs with shape ``(t, num_voxels)``.
+        percentile (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        percentile_values (np.ndarray): The percentile value of the voxels for each frame.
+    """
+    return _percentile_across_voxels_kernel(np.ascontiguousarray(voxel_tacs), percentile)
+
+
+@numba.njit(parallel=True, cache=True)
+def _percentile_across_voxels_kernel(voxel_tacs: np.ndarray, percentile: float) -> np.ndarray:
+    """Parallel kernel behind :func:`percentile_across_voxels_with_partition`.
+
+    Each frame is partitioned at the upper order statistic; the lower one is then the maximum of
+    the partitioned prefix, so a single introselect per frame suffices.
+
+    Args:
+        voxel_tacs (np.ndarray): A 2D array of voxel TACs with shape ``(t, num_voxels)``.
+        percentile (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        percentile_values (np.ndarray): The percentile value of the voxels for each frame.
+    """
+    num_frames, num_voxels = voxel_tacs.shape
+    rank = percentile / 100.0 * (num_voxels - 1)
+    lower_rank = int(np.floor(rank))
+    upper_rank = int(np.ceil(rank))
+    percentile_values = np.empty(num_frames, dtype=voxel_tacs.dtype)
+    for frame in numba.prange(num_frames):
+        partitioned = np.partition(voxel_tacs[frame], upper_rank)
+        upper_value = partitioned[upper_rank]
+        if upper_rank == lower_rank:
+            lower_value = upper_value
+        else:
+            lower_value = np.max(partitioned[:upper_rank])
+        percentile_values[frame] = lower_value + (rank - lower_rank) * (upper_value - lower_value)
+
+    return percentile_values
+
+
 def double_threshold_idif_from_4d_pet_necktangle(necktangle_matrix: np.ndarray,
                                                  percentile: float,
                                                  frame_midpoint_times: np.ndarray) -> np.ndarray:
@@ -134,7 +280,8 @@ def double_threshold_idif_from_4d_pet_necktangle(necktangle_matrix: np.ndarray,
     Finally, that carotid mask is applied to the 4D PET image, and the resulting 4D image undergoes percentile thresholding of the "percentile" value frame by frame to get the TAC.
 
     Args:
-        necktangle_matrix (np.ndarray): A 4D numpy array representing the PET necktangle matrix.
+        necktangle_matrix (np.ndarray): A 4D frame-major numpy array (shape ``(t, x, y, z)``, as
+            produced by :func:`load_fslmeants_to_numpy_3d`) representing the PET necktangle matrix.
         percentile (float): The percentile value to calculate the manual threshold.
         frame_midpoint_times (np.ndarray): An array of frame midpoint times.
 
@@ -144,19 +291,13 @@ def double_threshold_idif_from_4d_pet_necktangle(necktangle_matrix: np.ndarray,
     Raises:
         None.
     """
-    first_ten_frames = necktangle_matrix[:, :, :, :10]
-    frame_averages = np.nanmean(first_ten_frames, axis=(0, 1, 2))
-    bolus_index = np.argmax(frame_averages)
-    bolus_window_4d = necktangle_matrix[:, :, :, bolus_index - 1:bolus_index + 2]
-    bolus_window_average_3d = np.nanmean(bolus_window_4d, axis=3)
+    _bolus_index, bolus_window_average_3d = find_bolus_window_average(necktangle_matrix)
     automatic_threshold_value = np.nanpercentile(bolus_window_average_3d, 90)
-    automatic_threshold_mask_3d = np.where(bolus_window_average_3d > automatic_threshold_value, 1, np.nan)
-    tac = np.zeros((2, necktangle_matrix.shape[3]))
+    automatic_threshold_mask_3d = bolus_window_average_3d > automatic_threshold_value
+    carotid_voxel_tacs = necktangle_matrix[:, automatic_threshold_mask_3d]
+    tac = np.zeros((2, necktangle_matrix.shape[0]), dtype=necktangle_matrix.dtype)
     tac[0, :] = frame_midpoint_times
-    for frame in range(tac.shape[1]):
-        current_frame = necktangle_matrix[:, :, :, frame]
-        automatic_masked_frame = np.where(automatic_threshold_mask_3d == 1, current_frame, np.nan)
-        manual_threshold_value = np.nanpercentile(automatic_masked_frame, percentile)
-        tac[1, frame] = manual_threshold_value
+    tac[1, :] = percentile_across_voxels_with_partition(voxel_tacs=carotid_voxel_tacs,
+                                                        percentile=percentile)
 
     return tac
@@ -21,52 +21,53 @@ from typing import Callable, Tuple
 import os
 import json
 import numba
+from numba import cuda
 import numpy as np
 from ..utils.time_activity_curve import MultiTACAnalysisMixin
 from ..utils.image_io import safe_load_tac
 
 
-@numba.njit()
-def _line_fitting_make_rhs_matrix_from_xdata(xdata: np.ndarray) -> np.ndarray:
-    """Generates the RHS matrix for linear least squares fitting
-
-    Args:
-        xdata (np.ndarray): array of independent variable values
-
-    Returns:
-        np.ndarray: 2D matrix where first column is `xdata` and the second column is 1s.
-        
-    """
-    out_matrix = np.ones((len(xdata), 2), float)
-    out_matrix[:, 0] = xdata
-    return out_matrix
-
-
-@numba.njit()
+@numba.njit(fastmath=True, cache=True, inline='always')
 def fit_line_to_data_using_lls(xdata: np.ndarray, ydata: np.ndarray) -> np.ndarray:
     """Find the linear least squares solution given the x and y variables.
-    
-    Performs a linear least squares fit to the provided data. Explicitly calls numpy's ``linalg.lstsq`` method by
-    constructing the matrix equations. We assume that ``xdata`` and ``ydata`` have the same number of elements.
-    
+
+    Performs a linear least squares fit to the provided data. Since we are only fitting a line, we use the closed-form
+    normal-equation solution computed from the running sums of :math:`x`, :math:`y`, :math:`xy`, and :math:`x^2` in a
+    single pass, rather than constructing the matrix equations and calling an SVD-based solver. We assume that
+    ``xdata`` and ``ydata`` have the same number of elements. The function is marked ``inline='always'`` so that
+    jitted callers (the Patlak/Logan analyses) get the accumulation loop inlined at the call site, where the
+    compiler can see the tail-slice trip count and vectorize without any call overhead.
+
     Args:
         xdata: Array of independent variable values
         ydata: Array of dependent variable values
 
     Returns:
        Linear least squares solution. (m, b) values
-       
-    """
-    make_2d_matrix = _line_fitting_make_rhs_matrix_from_xdata
-    matrix = make_2d_matrix(xdata)
-    fit_ans = np.linalg.lstsq(matrix, ydata)[0]
-    return fit_ans
-
 
-@numba.njit()
+    """
+    num_points = len(xdata)
+    sum_x = 0.0
+    sum_y = 0.0
+    sum_xx = 0.0
+    sum_xy = 0.0
+    for i in range(num_points):
+        sum_x += xdata[i]
+        sum_y += ydata[i]
+        sum_xx += xdata[i] * xdata[i]
+        sum_xy += xdata[i] * ydata[i]
+    slope = (num_points * sum_xy - sum_x * sum_y) / (num_points * sum_xx - sum_x * sum_x)
+    intercept = (sum_y - slope * sum_x) / num_points
+    return np.asarray([slope, intercept])
+
+
+@numba.njit(fastmath=True, cache=True)
 def fit_line_to_data_using_lls_with_rsquared(xdata: np.ndarray, ydata: np.ndarray) -> Tuple[float, float, float]:
     """Fits a line to the data using least squares and explicitly computes the r-squared value.
 
+    Uses the same closed-form normal-equation solution as :func:`fit_line_to_data_using_lls`, followed by a second
+    pass to accumulate the residual and total sums of squares for the r-squared value.
+
     Args:
         xdata (np.ndarray): X-coordinates of the data.
         ydata (np.ndarray): Y-coordinates of the data.
@@ -75,24 +76,30 @@ def fit_line_to_data_using_lls_with_rsquared(xdata: np.ndarray, ydata: np.ndarra
         tuple: A tuple containing three float values: the intercept of the fitted line, the slope of the fitted line,
         and the r-squared value.
     """
-    make_2d_matrix = _line_fitting_make_rhs_matrix_from_xdata
-    matrix = make_2d_matrix(xdata)
-    fit_ans = np.linalg.lstsq(matrix, ydata)
-    
-    ss_res = fit_ans[1][0]
-    ss_tot = np.sum((np.mean(ydata) - ydata) ** 2.)
+    fit_ans = fit_line_to_data_using_lls(xdata=xdata, ydata=ydata)
+    slope, intercept = fit_ans[0], fit_ans[1]
+
+    mean_y = np.mean(ydata)
+    ss_res = 0.0
+    ss_tot = 0.0
+    for i in range(len(ydata)):
+        residual = ydata[i] - (slope * xdata[i] + intercept)
+        ss_res += residual * residual
+        ss_tot += (ydata[i] - mean_y) ** 2.
     r_squared = 1.0 - ss_res / ss_tot
-    return fit_ans[0][0], fit_ans[0][1], r_squared
+    return slope, intercept, r_squared
 
 
-@numba.njit()
+@numba.njit(fastmath=True, cache=True)
 def cumulative_trapezoidal_integral(xdata: np.ndarray, ydata: np.ndarray, initial: float = 0.0) -> np.ndarray:
     """Calculates the cumulative integral of `ydata` over `xdata` using the trapezoidal rule.
     
-    This function is based `heavily` on the :py:func:`scipy.integrate.cumulative_trapezoid` implementation
+    This function matches the behavior of the :py:func:`scipy.integrate.cumulative_trapezoid` implementation
     (`source <https://github.com/scipy/scipy/blob/v1.12.0/scipy/integrate/_quadrature.py#L432-L536>`_).
-    This implementation only works for 1D arrays and was implemented to work with :mod:`numba`.
-    
+    This implementation only works for 1D arrays and was implemented to work with :mod:`numba`. Rather than
+    composing ``np.diff``/``np.cumsum`` (which allocates a temporary per operation), the integral is
+    accumulated in a scalar over a single loop with one output allocation.
+
     Args:
         xdata (np.ndarray): Array for the integration coordinate.
         ydata (np.ndarray): Array for the values to integrate
@@ -100,15 +107,84 @@ def cumulative_trapezoidal_integral(xdata: np.ndarray, ydata: np.ndarray, initia
     Returns:
         (np.ndarray): Cumulative integral of ``ydata`` over ``xdata`` using the trapezoidal rule.
     """
-    dx = np.diff(xdata)
-    cum_int = np.zeros(len(xdata))
+    cum_int = np.empty(len(xdata))
     cum_int[0] = initial
-    cum_int[1:] = np.cumsum(dx * (ydata[1:] + ydata[:-1]) / 2.0)
-    
+    acc = 0.0
+    for i in range(1, len(xdata)):
+        acc += 0.5 * (xdata[i] - xdata[i - 1]) * (ydata[i] + ydata[i - 1])
+        cum_int[i] = acc
+
     return cum_int
 
 
-@numba.njit()
+@numba.njit(fastmath=True, cache=True)
+def _patlak_xy(tac_times: np.ndarray,
+               input_tac_values: np.ndarray,
+               region_tac_values: np.ndarray,
+               out_x: np.ndarray,
+               out_y: np.ndarray) -> None:
+    """Computes the Patlak x and y variables in a single fused pass.
+
+    Walks the TACs once, keeping the running trapezoidal integral of the input TAC in a scalar
+    accumulator, and writes the normalized x and y values directly into the output arrays. This
+    avoids the separate ``np.diff``/``np.cumsum``/divide temporaries that composing
+    :func:`cumulative_trapezoidal_integral` with elementwise division would allocate.
+
+    Args:
+        tac_times (np.ndarray): Array containing the sampled times.
+        input_tac_values (np.ndarray): Array of input TAC values. Assumed to be non-zero.
+        region_tac_values (np.ndarray): Array of ROI TAC values.
+        out_x (np.ndarray): Output array for the Patlak x-variable. Same length as ``tac_times``.
+        out_y (np.ndarray): Output array for the Patlak y-variable. Same length as ``tac_times``.
+
+    """
+    out_x[0] = 0.0
+    out_y[0] = region_tac_values[0] / input_tac_values[0]
+    acc = 0.0
+    for i in range(1, len(tac_times)):
+        acc += 0.5 * (tac_times[i] - tac_times[i - 1]) * (input_tac_values[i] + input_tac_values[i - 1])
+        out_x[i] = acc / input_tac_values[i]
+        out_y[i] = region_tac_values[i] / input_tac_values[i]
+
+
+@numba.njit(fastmath=True, cache=True)
+def _logan_xy(tac_times: np.ndarray,
+              input_tac_values: np.ndarray,
+              region_tac_values: np.ndarray,
+              divisor_tac_values: np.ndarray,
+              out_x: np.ndarray,
+              out_y: np.ndarray) -> None:
+    """Computes the Logan x and y variables in a single fused pass.
+
+    Keeps running trapezoidal integrals of both the input and region TACs in scalar accumulators
+    and writes the normalized x and y values directly into the output arrays. The divisor TAC is
+    the region TAC for standard Logan analysis and the input TAC for alternative Logan analysis.
+    Entries where the divisor TAC is zero are left at zero; callers discard them through their
+    non-zero index selection.
+
+    Args:
+        tac_times (np.ndarray): Array containing the sampled times.
+        input_tac_values (np.ndarray): Array of input TAC values.
+        region_tac_values (np.ndarray): Array of ROI TAC values.
+        divisor_tac_values (np.ndarray): Array of TAC values to normalize by.
+        out_x (np.ndarray): Output array for the Logan x-variable. Same length as ``tac_times``.
+        out_y (np.ndarray): Output array for the Logan y-variable. Same length as ``tac_times``.
+
+    """
+    out_x[0] = 0.0
+    out_y[0] = 0.0
+    acc_input = 0.0
+    acc_region = 0.0
+    for i in range(1, len(tac_times)):
+        half_dt = 0.5 * (tac_times[i] - tac_times[i - 1])
+        acc_input += half_dt * (input_tac_values[i] + input_tac_values[i - 1])
+        acc_region += half_dt * (region_tac_values[i] + region_tac_values[i - 1])
+        if divisor_tac_values[i] != 0.:
+            out_x[i] = acc_input / divisor_tac_values[i]
+            out_y[i] = acc_region / divisor_tac_values[i]
+
+
+@numba.njit(fastmath=True, cache=True)
 def calculate_patlak_x(tac_times: np.ndarray, tac_vals: np.ndarray) -> np.ndarray:
     r"""Calculates the x-variable in Patlak analysis :math:`\left(\frac{\int_{0}^{T}f(t)\mathrm{d}t}{f(T)}\right)`.
     
@@ -130,12 +206,16 @@ def calculate_patlak_x(tac_times: np.ndarray, tac_vals: np.ndarray) -> np.ndarra
         (np.ndarray): Patlak x-variable. Cumulative integral of activity divided by activity.
         
     """
-    cumulative_integral = cumulative_trapezoidal_integral(xdata=tac_times, ydata=tac_vals, initial=0.0)
-    
-    return cumulative_integral / tac_vals
+    patlak_x = np.zeros(len(tac_times))
+    acc = 0.0
+    for i in range(1, len(tac_times)):
+        acc += 0.5 * (tac_times[i] - tac_times[i - 1]) * (tac_vals[i] + tac_vals[i - 1])
+        patlak_x[i] = acc / tac_vals[i]
+
+    return patlak_x
 
 
-@numba.njit()
+@numba.njit(cache=True)
 def get_index_from_threshold(times_in_minutes: np.ndarray, t_thresh_in_minutes: float) -> int:
     """Get the index after which all times are greater than the threshold.
 
@@ -147,16 +227,17 @@ def get_index_from_threshold(times_in_minutes: np.ndarray, t_thresh_in_minutes:
         int: Index for first time greater than or equal to the threshold time.
         
     Notes:
-        If the threshold value is larger than the array, we return -1.
-        
+        If the threshold value is larger than the array, we return -1. Since the times are
+        monotonically increasing, we use a binary search instead of scanning the whole array.
+
     """
-    if t_thresh_in_minutes > np.max(times_in_minutes):
+    index = np.searchsorted(times_in_minutes, t_thresh_in_minutes, side='left')
+    if index == len(times_in_minutes):
         return -1
-    else:
-        return np.argwhere(times_in_minutes >= t_thresh_in_minutes)[0, 0]
+    return index
 
 
-@numba.njit()
+@numba.njit(fastmath=True, cache=True)
 def patlak_analysis(tac_times_in_minutes: np.ndarray,
                     input_tac_values: np.ndarray,
                     region_tac_values: np.ndarray,
@@ -188,16 +269,20 @@ def patlak_analysis(tac_times_in_minutes: np.ndarray,
     if len(tac_times_in_minutes[non_zero_indices][t_thresh:]) <= 2:
         return np.asarray([np.nan, np.nan])
 
-    patlak_x = calculate_patlak_x(tac_times=tac_times_in_minutes[non_zero_indices],
-                                  tac_vals=input_tac_values[non_zero_indices])
-    patlak_y = region_tac_values[non_zero_indices] / input_tac_values[non_zero_indices]
+    patlak_x = np.zeros(len(non_zero_indices))
+    patlak_y = np.zeros(len(non_zero_indices))
+    _patlak_xy(tac_times=tac_times_in_minutes[non_zero_indices],
+               input_tac_values=input_tac_values[non_zero_indices],
+               region_tac_values=region_tac_values[non_zero_indices],
+               out_x=patlak_x,
+               out_y=patlak_y)
 
     patlak_values = fit_line_to_data_using_lls(xdata=patlak_x[t_thresh:], ydata=patlak_y[t_thresh:])
 
     return patlak_values
 
 
-@numba.njit()
+@numba.njit(fastmath=True, cache=True)
 def patlak_analysis_with_rsquared(tac_times_in_minutes: np.ndarray,
                                   input_tac_values: np.ndarray,
                                   region_tac_values: np.ndarray,
@@ -228,16 +313,20 @@ def patlak_analysis_with_rsquared(tac_times_in_minutes: np.ndarray,
     if len(tac_times_in_minutes[non_zero_indices][t_thresh:]) <= 2:
         return np.nan, np.nan, np.nan
 
-    patlak_x = calculate_patlak_x(tac_times=tac_times_in_minutes[non_zero_indices],
-                                  tac_vals=input_tac_values[non_zero_indices])
-    patlak_y = region_tac_values[non_zero_indices] / input_tac_values[non_zero_indices]
+    patlak_x = np.zeros(len(non_zero_indices))
+    patlak_y = np.zeros(len(non_zero_indices))
+    _patlak_xy(tac_times=tac_times_in_minutes[non_zero_indices],
+               input_tac_values=input_tac_values[non_zero_indices],
+               region_tac_values=region_tac_values[non_zero_indices],
+               out_x=patlak_x,
+               out_y=patlak_y)
 
     patlak_values = fit_line_to_data_using_lls_with_rsquared(xdata=patlak_x[t_thresh:], ydata=patlak_y[t_thresh:])
 
     return patlak_values
 
 
-@numba.njit
+@numba.njit(fastmath=True, cache=True)
 def logan_analysis(tac_times_in_minutes: np.ndarray,
                    input_tac_values: np.ndarray,
                    region_tac_values: np.ndarray,
@@ -274,17 +363,23 @@ def logan_analysis(tac_times_in_minutes: np.ndarray,
     if len(tac_times_in_minutes[non_zero_indices][t_thresh:]) <= 2:
         return np.asarray([np.nan, np.nan])
 
-    logan_x = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=input_tac_values)
-    logan_y = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=region_tac_values)
+    logan_x = np.zeros(len(tac_times_in_minutes))
+    logan_y = np.zeros(len(tac_times_in_minutes))
+    _logan_xy(tac_times=tac_times_in_minutes,
+              input_tac_values=input_tac_values,
+              region_tac_values=region_tac_values,
+              divisor_tac_values=region_tac_values,
+              out_x=logan_x,
+              out_y=logan_y)
 
-    logan_x = logan_x[non_zero_indices][t_thresh:] / region_tac_values[non_zero_indices][t_thresh:]
-    logan_y = logan_y[non_zero_indices][t_thresh:] / region_tac_values[non_zero_indices][t_thresh:]
+    logan_x = logan_x[non_zero_indices][t_thresh:]
+    logan_y = logan_y[non_zero_indices][t_thresh:]
 
     fit_ans = fit_line_to_data_using_lls(xdata=logan_x, ydata=logan_y)
     return fit_ans
 
 
-@numba.njit()
+@numba.njit(fastmath=True, cache=True)
 def logan_analysis_with_rsquared(tac_times_in_minutes: np.ndarray,
                                  input_tac_values: np.ndarray,
                                  region_tac_values: np.ndarray,
@@ -318,18 +413,24 @@ def logan_analysis_with_rsquared(tac_times_in_minutes: np.ndarray,
     if len(tac_times_in_minutes[non_zero_indices][t_thresh:]) <= 2:
         return np.nan, np.nan, np.nan
 
-    logan_x = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=input_tac_values)
-    logan_y = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=region_tac_values)
+    logan_x = np.zeros(len(tac_times_in_minutes))
+    logan_y = np.zeros(len(tac_times_in_minutes))
+    _logan_xy(tac_times=tac_times_in_minutes,
+              input_tac_values=input_tac_values,
+              region_tac_values=region_tac_values,
+              divisor_tac_values=region_tac_values,
+              out_x=logan_x,
+              out_y=logan_y)
 
-    logan_x = logan_x[non_zero_indices][t_thresh:] / region_tac_values[non_zero_indices][t_thresh:]
-    logan_y = logan_y[non_zero_indices][t_thresh:] / region_tac_values[non_zero_indices][t_thresh:]
+    logan_x = logan_x[non_zero_indices][t_thresh:]
+    logan_y = logan_y[non_zero_indices][t_thresh:]
 
     logan_values = fit_line_to_data_using_lls_with_rsquared(xdata=logan_x, ydata=logan_y)
 
     return logan_values
 
 
-@numba.njit
+@numba.njit(fastmath=True, cache=True)
 def alternative_logan_analysis(tac_times_in_minutes: np.ndarray,
                                input_tac_values: np.ndarray,
                                region_tac_values: np.ndarray,
@@ -368,17 +469,23 @@ def alternative_logan_analysis(tac_times_in_minutes: np.ndarray,
     if len(tac_times_in_minutes[non_zero_indices][t_thresh:]) <= 2:
         return np.asarray([np.nan, np.nan])
 
-    alt_logan_x = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=input_tac_values)
-    alt_logan_y = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=region_tac_values)
+    alt_logan_x = np.zeros(len(tac_times_in_minutes))
+    alt_logan_y = np.zeros(len(tac_times_in_minutes))
+    _logan_xy(tac_times=tac_times_in_minutes,
+              input_tac_values=input_tac_values,
+              region_tac_values=region_tac_values,
+              divisor_tac_values=input_tac_values,
+              out_x=alt_logan_x,
+              out_y=alt_logan_y)
 
-    alt_logan_x = alt_logan_x[non_zero_indices][t_thresh:] / input_tac_values[non_zero_indices][t_thresh:]
-    alt_logan_y = alt_logan_y[non_zero_indices][t_thresh:] / input_tac_values[non_zero_indices][t_thresh:]
+    alt_logan_x = alt_logan_x[non_zero_indices][t_thresh:]
+    alt_logan_y = alt_logan_y[non_zero_indices][t_thresh:]
 
     fit_ans = fit_line_to_data_using_lls(xdata=alt_logan_x, ydata=alt_logan_y)
     return fit_ans
 
 
-@numba.njit()
+@numba.njit(fastmath=True, cache=True)
 def alternative_logan_analysis_with_rsquared(tac_times_in_minutes: np.ndarray,
                                              input_tac_values: np.ndarray,
                                              region_tac_values: np.ndarray,
@@ -411,11 +518,17 @@ def alternative_logan_analysis_with_rsquared(tac_times_in_minutes: np.ndarray,
     if len(tac_times_in_minutes[non_zero_indices][t_thresh:]) <= 2:
         return np.nan, np.nan, np.nan
 
-    alt_logan_x = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=input_tac_values)
-    alt_logan_y = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=region_tac_values)
+    alt_logan_x = np.zeros(len(tac_times_in_minutes))
+    alt_logan_y = np.zeros(len(tac_times_in_minutes))
+    _logan_xy(tac_times=tac_times_in_minutes,
+              input_tac_values=input_tac_values,
+              region_tac_values=region_tac_values,
+              divisor_tac_values=input_tac_values,
+              out_x=alt_logan_x,
+              out_y=alt_logan_y)
 
-    alt_logan_x = alt_logan_x[non_zero_indices][t_thresh:] / input_tac_values[non_zero_indices][t_thresh:]
-    alt_logan_y = alt_logan_y[non_zero_indices][t_thresh:] / input_tac_values[non_zero_indices][t_thresh:]
+    alt_logan_x = alt_logan_x[non_zero_indices][t_thresh:]
+    alt_logan_y = alt_logan_y[non_zero_indices][t_thresh:]
 
     alt_logan_values = fit_line_to_data_using_lls_with_rsquared(xdata=alt_logan_x,
                                                                 ydata=alt_logan_y)
@@ -423,6 +536,364 @@ def alternative_logan_analysis_with_rsquared(tac_times_in_minutes: np.ndarray,
     return alt_logan_values
 
 
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def patlak_analysis_voxelwise(tac_times_in_minutes: np.ndarray,
+                              input_tac_values: np.ndarray,
+                              region_tac_values: np.ndarray,
+                              t_thresh_in_minutes: float) -> np.ndarray:
+    """Performs Patlak analysis on a batch of region TACs in parallel over all voxels.
+
+    Batched counterpart of :func:`patlak_analysis` for parametric imaging. Since the Patlak
+    x-variable only depends on the input TAC, it is computed once with :func:`_patlak_xy`-style
+    accumulation and shared across all voxels. Each voxel then accumulates the four running sums
+    of the closed-form line fit directly from its y-values, so the parallel loop performs no
+    per-voxel allocations.
+
+    Args:
+        tac_times_in_minutes (np.ndarray): Array of times in minutes.
+        input_tac_values (np.ndarray): Array of input TAC values.
+        region_tac_values (np.ndarray): 2D array of ROI TAC values with shape ``(num_voxels, num_frames)``.
+        t_thresh_in_minutes (float): Threshold time in minutes. Line is fit for all values after the threshold.
+
+    Returns:
+        (np.ndarray): Array of shape ``(num_voxels, 2)`` containing :math:`(K_{i}, V_{0})` values per voxel.
+
+    .. important::
+        * We assume that the input TAC and ROI TAC values are sampled at the same times.
+
+    """
+    num_voxels = region_tac_values.shape[0]
+    fit_values = np.full((num_voxels, 2), np.nan)
+
+    non_zero_indices = np.argwhere(input_tac_values != 0.).T[0]
+    if len(non_zero_indices) <= 2:
+        return fit_values
+
+    t_thresh = get_index_from_threshold(times_in_minutes=tac_times_in_minutes[non_zero_indices],
+                                        t_thresh_in_minutes=t_thresh_in_minutes)
+    if len(tac_times_in_minutes[non_zero_indices][t_thresh:]) <= 2:
+        return fit_values
+
+    filtered_times = tac_times_in_minutes[non_zero_indices]
+    filtered_input = input_tac_values[non_zero_indices]
+    patlak_x = np.zeros(len(non_zero_indices))
+    acc = 0.0
+    for i in range(1, len(filtered_times)):
+        acc += 0.5 * (filtered_times[i] - filtered_times[i - 1]) * (filtered_input[i] + filtered_input[i - 1])
+        patlak_x[i] = acc / filtered_input[i]
+
+    num_fit_points = len(filtered_times) - t_thresh
+    for voxel in numba.prange(num_voxels):
+        sum_x = 0.0
+        sum_y = 0.0
+        sum_xx = 0.0
+        sum_xy = 0.0
+        for i in range(t_thresh, len(filtered_times)):
+            x_val = patlak_x[i]
+            y_val = region_tac_values[voxel, non_zero_indices[i]] / filtered_input[i]
+            sum_x += x_val
+            sum_y += y_val
+            sum_xx += x_val * x_val
+            sum_xy += x_val * y_val
+        slope = (num_fit_points * sum_xy - sum_x * sum_y) / (num_fit_points * sum_xx - sum_x * sum_x)
+        fit_values[voxel, 0] = slope
+        fit_values[voxel, 1] = (sum_y - slope * sum_x) / num_fit_points
+
+    return fit_values
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def logan_analysis_voxelwise(tac_times_in_minutes: np.ndarray,
+                             input_tac_values: np.ndarray,
+                             region_tac_values: np.ndarray,
+                             t_thresh_in_minutes: float) -> np.ndarray:
+    """Performs Logan analysis on a batch of region TACs in parallel over all voxels.
+
+    Batched counterpart of :func:`logan_analysis` for parametric imaging. The cumulative integral
+    of the input TAC is computed once and shared across voxels; each voxel keeps its own running
+    region integral and accumulates the closed-form line-fit sums in a single pass, skipping
+    frames where its region TAC is zero just as :func:`logan_analysis` does.
+
+    Args:
+        tac_times_in_minutes (np.ndarray): Array of times in minutes.
+        input_tac_values (np.ndarray): Array of input TAC values.
+        region_tac_values (np.ndarray): 2D array of ROI TAC values with shape ``(num_voxels, num_frames)``.
+        t_thresh_in_minutes (float): Threshold time in minutes. Line is fit for all values after the threshold.
+
+    Returns:
+        (np.ndarray): Array of shape ``(num_voxels, 2)`` containing (slope, intercept) values per voxel.
+
+    .. important::
+        * The interpretation of the returned values depends on the underlying kinetic model.
+        * We assume that the input TAC and ROI TAC values are sampled at the same times.
+
+    """
+    num_voxels = region_tac_values.shape[0]
+    num_frames = len(tac_times_in_minutes)
+    fit_values = np.full((num_voxels, 2), np.nan)
+
+    input_cum_int = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=input_tac_values)
+
+    for voxel in numba.prange(num_voxels):
+        num_non_zero = 0
+        t_thresh = -1
+        for i in range(num_frames):
+            if region_tac_values[voxel, i] != 0.:
+                if t_thresh == -1 and tac_times_in_minutes[i] >= t_thresh_in_minutes:
+                    t_thresh = num_non_zero
+                num_non_zero += 1
+        if num_non_zero <= 2 or t_thresh == -1 or (num_non_zero - t_thresh) <= 2:
+            continue
+
+        sum_x = 0.0
+        sum_y = 0.0
+        sum_xx = 0.0
+        sum_xy = 0.0
+        region_cum_int = 0.0
+        non_zero_position = 0
+        for i in range(num_frames):
+            if i > 0:
+                region_cum_int += (0.5 * (tac_times_in_minutes[i] - tac_times_in_minutes[i - 1])
+                                   * (region_tac_values[voxel, i] + region_tac_values[voxel, i - 1]))
+            if region_tac_values[voxel, i] != 0.:
+                if non_zero_position >= t_thresh:
+                    x_val = input_cum_int[i] / region_tac_values[voxel, i]
+                    y_val = region_cum_int / region_tac_values[voxel, i]
+                    sum_x += x_val
+                    sum_y += y_val
+                    sum_xx += x_val * x_val
+                    sum_xy += x_val * y_val
+                non_zero_position += 1
+
+        num_fit_points = num_non_zero - t_thresh
+        slope = (num_fit_points * sum_xy - sum_x * sum_y) / (num_fit_points * sum_xx - sum_x * sum_x)
+        fit_values[voxel, 0] = slope
+        fit_values[voxel, 1] = (sum_y - slope * sum_x) / num_fit_points
+
+    return fit_values
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def alternative_logan_analysis_voxelwise(tac_times_in_minutes: np.ndarray,
+                                         input_tac_values: np.ndarray,
+                                         region_tac_values: np.ndarray,
+                                         t_thresh_in_minutes: float) -> np.ndarray:
+    """Performs alternative Logan analysis on a batch of region TACs in parallel over all voxels.
+
+    Batched counterpart of :func:`alternative_logan_analysis` for parametric imaging. Since both
+    the non-zero filtering and the normalization use the input TAC, the x-variable is computed
+    once and shared across all voxels; each voxel keeps its own running region integral and
+    accumulates the closed-form line-fit sums in a single pass with no per-voxel allocations.
+
+    Args:
+        tac_times_in_minutes (np.ndarray): Array of times in minutes.
+        input_tac_values (np.ndarray): Array of input TAC values.
+        region_tac_values (np.ndarray): 2D array of ROI TAC values with shape ``(num_voxels, num_frames)``.
+        t_thresh_in_minutes (float): Threshold time in minutes. Line is fit for all values after the threshold.
+
+    Returns:
+        (np.ndarray): Array of shape ``(num_voxels, 2)`` containing (slope, intercept) values per voxel.
+
+    .. important::
+        * The interpretation of the returned values depends on the underlying kinetic model.
+        * We assume that the input TAC and ROI TAC values are sampled at the same times.
+
+    """
+    num_voxels = region_tac_values.shape[0]
+    num_frames = len(tac_times_in_minutes)
+    fit_values = np.full((num_voxels, 2), np.nan)
+
+    non_zero_indices = np.argwhere(input_tac_values != 0.).T[0]
+    if len(non_zero_indices) <= 2:
+        return fit_values
+
+    t_thresh = get_index_from_threshold(times_in_minutes=tac_times_in_minutes[non_zero_indices],
+                                        t_thresh_in_minutes=t_thresh_in_minutes)
+    if len(tac_times_in_minutes[non_zero_indices][t_thresh:]) <= 2:
+        return fit_values
+
+    input_cum_int = cumulative_trapezoidal_integral(xdata=tac_times_in_minutes, ydata=input_tac_values)
+    fit_indices = non_zero_indices[t_thresh:]
+    num_fit_points = len(fit_indices)
+
+    for voxel in numba.prange(num_voxels):
+        sum_x = 0.0
+        sum_y = 0.0
+        sum_xx = 0.0
+        sum_xy = 0.0
+        region_cum_int = 0.0
+        fit_position = 0
+        for i in range(num_frames):
+            if i > 0:
+                region_cum_int += (0.5 * (tac_times_in_minutes[i] - tac_times_in_minutes[i - 1])
+                                   * (region_tac_values[voxel, i] + region_tac_values[voxel, i - 1]))
+            if fit_position < num_fit_points and i == fit_indices[fit_position]:
+                x_val = input_cum_int[i] / input_tac_values[i]
+                y_val = region_cum_int / input_tac_values[i]
+                sum_x += x_val
+                sum_y += y_val
+                sum_xx += x_val * x_val
+                sum_xy += x_val * y_val
+                fit_position += 1
+
+        slope = (num_fit_points * sum_xy - sum_x * sum_y) / (num_fit_points * sum_xx - sum_x * sum_x)
+        fit_values[voxel, 0] = slope
+        fit_values[voxel, 1] = (sum_y - slope * sum_x) / num_fit_points
+
+    return fit_values
+
+
+_CUDA_MAX_FIT_POINTS = 1024
+"""int: Maximum number of post-threshold fit points the CUDA Patlak kernel's shared-memory buffer holds."""
+
+
+@cuda.jit
+def _patlak_voxel_kernel(patlak_x_tail, fit_indices, input_tac_values, region_tac_values, out):
+    """CUDA kernel computing the closed-form Patlak line fit for one voxel per thread.
+
+    The post-threshold Patlak x-values are shared by every voxel, so each block cooperatively
+    loads them into shared memory once. Each thread then accumulates the four line-fit sums for
+    its voxel in registers and writes (slope, intercept) to the output.
+
+    Args:
+        patlak_x_tail: Patlak x-values past the threshold index. At most ``_CUDA_MAX_FIT_POINTS`` long.
+        fit_indices: Frame indices (into the full TACs) of the post-threshold fit points.
+        input_tac_values: Full input TAC values.
+        region_tac_values: 2D array of region TAC values with shape ``(num_voxels, num_frames)``.
+        out: Output array of shape ``(num_voxels, 2)`` receiving (slope, intercept) per voxel.
+
+    """
+    shared_x = cuda.shared.array(shape=(_CUDA_MAX_FIT_POINTS,), dtype=numba.float64)
+    num_fit_points = patlak_x_tail.shape[0]
+    load_index = cuda.threadIdx.x
+    while load_index < num_fit_points:
+        shared_x[load_index] = patlak_x_tail[load_index]
+        load_index += cuda.blockDim.x
+    cuda.syncthreads()
+
+    voxel = cuda.grid(1)
+    if voxel >= region_tac_values.shape[0]:
+        return
+
+    sum_x = 0.0
+    sum_y = 0.0
+    sum_xx = 0.0
+    sum_xy = 0.0
+    for i in range(num_fit_points):
+        x_val = shared_x[i]
+        frame = fit_indices[i]
+        y_val = region_tac_values[voxel, frame] / input_tac_values[frame]
+        sum_x += x_val
+        sum_y += y_val
+        sum_xx += x_val * x_val
+        sum_xy += x_val * y_val
+    slope = (num_fit_points * sum_xy - sum_x * sum_y) / (num_fit_points * sum_xx - sum_x * sum_x)
+    out[voxel, 0] = slope
+    out[voxel, 1] = (sum_y - slope * sum_x) / num_fit_points
+
+
+def patlak_analysis_voxelwise_cuda(tac_times_in_minutes: np.ndarray,
+                                   input_tac_values: np.ndarray,
+                                   region_tac_values: np.ndarray,
+                                   t_thresh_in_minutes: float) -> np.ndarray:
+    """Performs Patlak analysis on a batch of region TACs on the GPU, one voxel per CUDA thread.
+
+    GPU counterpart of :func:`patlak_analysis_voxelwise` for whole-brain parametric imaging. The
+    shared Patlak x-variable is computed once on the host; the region-TAC array is transferred to
+    the device and each CUDA thread performs the closed-form line fit for one voxel, with the
+    post-threshold x-values cached in shared memory.
+
+    Args:
+        tac_times_in_minutes (np.ndarray): Array of times in minutes.
+        input_tac_values (np.ndarray): Array of input TAC values.
+        region_tac_values (np.ndarray): 2D array of ROI TAC values with shape ``(num_voxels, num_frames)``.
+        t_thresh_in_minutes (float): Threshold time in minutes. Line is fit for all values after the threshold.
+
+    Returns:
+        (np.ndarray): Array of shape ``(num_voxels, 2)`` containing :math:`(K_{i}, V_{0})` values per voxel.
+
+    Raises:
+        RuntimeError: If no CUDA-capable device is available.
+        ValueError: If the number of post-threshold fit points exceeds the kernel's shared-memory capacity.
+
+    .. important::
+        * We assume that the input TAC and ROI TAC values are sampled at the same times.
+
+    """
+    if not cuda.is_available():
+        raise RuntimeError("No CUDA-capable device is available. Use patlak_analysis_voxelwise instead.")
+
+    num_voxels = region_tac_values.shape[0]
+    fit_values = np.full((num_voxels, 2), np.nan)
+
+    non_zero_indices = np.argwhere(input_tac_values != 0.).T[0]
+    if len(non_zero_indices) <= 2:
+        return fit_values
+
+    t_thresh = get_index_from_threshold(times_in_minutes=tac_times_in_minutes[non_zero_indices],
+                                        t_thresh_in_minutes=t_thresh_in_minutes)
+    if len(tac_times_in_minutes[non_zero_indices][t_thresh:]) <= 2:
+        return fit_values
+
+    patlak_x = calculate_patlak_x(tac_times=tac_times_in_minutes[non_zero_indices],
+                                  tac_vals=input_tac_values[non_zero_indices])
+    patlak_x_tail = np.ascontiguousarray(patlak_x[t_thresh:])
+    fit_indices = np.ascontiguousarray(non_zero_indices[t_thresh:])
+    if len(fit_indices) > _CUDA_MAX_FIT_POINTS:
+        raise ValueError(f"Number of fit points ({len(fit_indices)}) exceeds the CUDA kernel's "
+                         f"shared-memory capacity ({_CUDA_MAX_FIT_POINTS}).")
+
+    device_region_tacs = cuda.to_device(np.ascontiguousarray(region_tac_values))
+    device_out = cuda.to_device(fit_values)
+    threads_per_block = 256
+    blocks_per_grid = (num_voxels + threads_per_block - 1) // threads_per_block
+    _patlak_voxel_kernel[blocks_per_grid, threads_per_block](cuda.to_device(patlak_x_tail),
+                                                             cuda.to_device(fit_indices),
+                                                             cuda.to_device(input_tac_values),
+                                                             device_region_tacs,
+                                                             device_out)
+    device_out.copy_to_host(fit_values)
+
+    return fit_values
+
+
+def warmup_numba_kernels() -> None:
+    """Compiles every jitted function in this module by calling it on tiny dummy TACs.
+
+    All the jitted functions in this module are decorated with ``cache=True``, so the compiled
+    machine code is written to an on-disk cache the first time each function is called. Calling
+    this once (e.g. during installation, or before timing-sensitive work) pays the one-time JIT
+    compilation cost up front; subsequent runs load from the cache instead of recompiling.
+
+    Returns:
+        None
+
+    """
+    dummy_times = np.arange(6.0)
+    dummy_input = np.exp(-0.1 * dummy_times) + 1.0
+    dummy_region = np.exp(-0.2 * dummy_times) + 1.0
+    dummy_region_2d = dummy_region.reshape(1, -1)
+    cumulative_trapezoidal_integral(xdata=dummy_times, ydata=dummy_input)
+    calculate_patlak_x(tac_times=dummy_times, tac_vals=dummy_input)
+    get_index_from_threshold(times_in_minutes=dummy_times, t_thresh_in_minutes=0.0)
+    fit_line_to_data_using_lls(xdata=dummy_times, ydata=dummy_input)
+    fit_line_to_data_using_lls_with_rsquared(xdata=dummy_times, ydata=dummy_input)
+    for analysis_func in (patlak_analysis, patlak_analysis_with_rsquared,
+                          logan_analysis, logan_analysis_with_rsquared,
+                          alternative_logan_analysis, alternative_logan_analysis_with_rsquared):
+        analysis_func(tac_times_in_minutes=dummy_times,
+                      input_tac_values=dummy_input,
+                      region_tac_values=dummy_region,
+                      t_thresh_in_minutes=0.0)
+    for analysis_func in (patlak_analysis_voxelwise,
+                          logan_analysis_voxelwise,
+                          alternative_logan_analysis_voxelwise):
+        analysis_func(tac_times_in_minutes=dummy_times,
+                      input_tac_values=dummy_input,
+                      region_tac_values=dummy_region_2d,
+                      t_thresh_in_minutes=0.0)
+
+
 def get_graphical_analysis_method(method_name: str) -> Callable:
     """
     Function for obtaining the appropriate graphical analysis method.
@@ -469,6 +940,43 @@ def get_graphical_analysis_method(method_name: str) -> Callable:
     raise ValueError(f"Invalid method_name! Must be either 'patlak', 'logan', or 'alt_logan'. Got {method_name}")
 
 
+def get_graphical_analysis_method_voxelwise(method_name: str) -> Callable:
+    """
+    Function for obtaining the appropriate batched voxelwise graphical analysis method.
+
+    This function accepts a string specifying a graphical time-activity curve (TAC) analysis method. It returns a
+    reference to the batched function that performs the selected analysis method over a full ``(num_voxels,
+    num_frames)`` region-TAC array in one parallel call. Dispatching once per image, rather than once per voxel,
+    keeps all the per-voxel work inside a single jitted parallel loop.
+
+    Args:
+        method_name (str): The name of the graphical method. This should be one of the following strings: 'patlak',
+                           'logan', or 'alt_logan'.
+
+    Returns:
+        function: A reference to the batched function that performs the corresponding graphical TAC analysis. The
+        returned function takes the TAC times in minutes, input TAC values, a 2D array of region TAC values, and the
+        threshold time in minutes, and returns a ``(num_voxels, 2)`` array of (slope, intercept) values.
+
+    Raises:
+        ValueError: If `method_name` is not one of the supported graphical analysis methods, i.e., 'patlak', 'logan', or
+                    'alt_logan'.
+
+    See Also:
+        * :func:`patlak_analysis_voxelwise`
+        * :func:`logan_analysis_voxelwise`
+        * :func:`alternative_logan_analysis_voxelwise`
+
+    """
+    if method_name == "patlak":
+        return patlak_analysis_voxelwise
+    if method_name == "logan":
+        return logan_analysis_voxelwise
+    if method_name == "alt_logan":
+        return alternative_logan_analysis_voxelwise
+    raise ValueError(f"Invalid method_name! Must be either 'patlak', 'logan', or 'alt_logan'. Got {method_name}")
+
+
 def get_graphical_analysis_method_with_rsquared(method_name: str) -> Callable:
     """
     Function for obtaining the appropriate graphical analysis method which also calculates the r-squared value.
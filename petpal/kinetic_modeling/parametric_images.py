@@ -94,9 +94,10 @@ def generate_parametric_images_with_graphical_method(pTAC_times: np.ndarray,
     """
     Generates parametric images for 4D-PET data using a specified graphical analysis method.
 
-    This function maps one of the predefined method names to the corresponding analysis function,
-    and then generates parametric images by applying it to the given 4D-PET data using the
-    `apply_linearized_analysis_to_all_voxels` function.
+    This function maps one of the predefined method names to the corresponding batched voxelwise
+    analysis function, reshapes the 4D-PET data into a ``(num_voxels, num_frames)`` array, and
+    computes all voxel fits in one parallel call. Dispatching the method once per image keeps the
+    per-voxel work inside a single jitted loop with no Python-level call overhead.
 
     Args:
         pTAC_times (np.ndarray): A 1D array representing the input TAC times in minutes.
@@ -121,13 +122,16 @@ def generate_parametric_images_with_graphical_method(pTAC_times: np.ndarray,
        ValueError: If the `method_name` is not one of the following: 'patlak', 'logan', 'alt_logan'.
     """
 
-    analysis_func = graphical_analysis.get_graphical_analysis_method(
+    analysis_func = graphical_analysis.get_graphical_analysis_method_voxelwise(
         method_name=method_name)
-    slope_img, intercept_img = apply_linearized_analysis_to_all_voxels(pTAC_times=pTAC_times,
-                                                                       pTAC_vals=pTAC_vals,
-                                                                       tTAC_img=tTAC_img,
-                                                                       t_thresh_in_mins=t_thresh_in_mins,
-                                                                       analysis_func=analysis_func)
+    img_dims = tTAC_img.shape
+    region_tacs = np.ascontiguousarray(tTAC_img.reshape(-1, img_dims[3]))
+    fit_values = analysis_func(tac_times_in_minutes=pTAC_times,
+                               input_tac_values=pTAC_vals,
+                               region_tac_values=region_tacs,
+                               t_thresh_in_minutes=t_thresh_in_mins)
+    slope_img = fit_values[:, 0].reshape(img_dims[:3]).copy()
+    intercept_img = fit_values[:, 1].reshape(img_dims[:3]).copy()
 
     return slope_img, intercept_img
 
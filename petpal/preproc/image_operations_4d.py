@@ -385,11 +385,11 @@ def binarize_image_with_threshold(input_image_numpy: np.ndarray,
         upper_bound (float): Upper bound of the threshold.
 
     Returns:
-        bounded_image (np.ndarray): Binary mask of original image where voxels within threshold are 1, and 0 elsewhere.
+        bounded_image (np.ndarray): Binary ``uint8`` mask of original image where voxels within threshold are 1,
+            and 0 elsewhere.
     """
-    bounded_image = np.zeros(input_image_numpy.shape)
     bounded_image_where = (input_image_numpy > lower_bound) & (input_image_numpy < upper_bound)
-    bounded_image[bounded_image_where] = 1
+    bounded_image = bounded_image_where.astype(np.uint8)
     return bounded_image
 
 